@@ -1,23 +1,71 @@
+import atexit
 import csv
-from typing import Iterable
+import io
+import os
+import sys
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Literal, Sequence
 
 from utils import open_with_create_missing_directories
 
 
+# how a log file is opened:
+# `truncate` clears the file out at the start of the run,
+# `append` keeps what's already there and adds new rows to the end.
+LogfileMode = Literal["truncate", "append"]
+
+# values that repeat across many rows.
+# they are shared by all rows instead of being rebuilt for each one.
+STATUS_OK = sys.intern("ok")
+NOTE_PARAM_CREATED = sys.intern("param CREATED")
+NOTE_PARAM_REMOVED = sys.intern("param REMOVED")
+
+HEADER_ROW = ["page title", "param_name", "error status", "old value", "new value", "has value changed?", "notes"]
+
+
 class LogfileLogger:
     """Disk logger for modification operations."""
 
-    def __init__(self, file_log_paths: list[str]):
-        self.file_log_paths = file_log_paths
+    FLUSH_EVERY = 256
+    """Number of buffered rows after which they are written to the log files."""
+
+    def __init__(self, file_log_paths: list[tuple[str, LogfileMode]]):
+        """
+        Opens the log files.
+
+        :param file_log_paths: A list of log file paths, each paired with the mode to open it in.
+        """
+
+        self.file_log_paths = [log_path for log_path, _ in file_log_paths]
+
+        # rows are formatted as csv only once, into this buffer, and the resulting text is written to every file
+        self.__formatted = io.StringIO()
+        self.__csv_writer = csv.writer(self.__formatted)
+
+        # generate log files or clear them out if they exist.
+        # files are kept open for the whole run, so rows don't cost an open/close each.
+        self.__files = []
+        for log_path, mode in file_log_paths:
+            # header goes only into files that don't have it yet
+            needs_header = mode == "truncate" or not os.path.isfile(log_path) or os.path.getsize(log_path) == 0
 
-        # generate log files or clear them out if they exist
-        for log_path in file_log_paths:
-            open_with_create_missing_directories(log_path, "w").close()
+            f = open_with_create_missing_directories(
+                log_path, "w" if mode == "truncate" else "a", newline="", buffering=65536
+            )
+            if needs_header:
+                f.write(self.__format_rows([HEADER_ROW]))
 
-        # write initial rows
-        self.__write_row(
-            ["page title", "param_name", "error status", "old value", "new value", "has value changed?", "notes"]
-        )
+            self.__files.append(f)
+
+        self.__buffered_rows: list[Iterable[str]] = []
+        self.__closed = False
+
+        # rows collected by the currently open `batch()`. `None` when there's no batch.
+        self.__batch_rows: list[Iterable[str]] | None = None
+        self.__batch_needs_flush = False
+
+        # make sure buffered rows end up on the disk even if the run is interrupted
+        atexit.register(self.close)
 
     def log_note(self, page_title: str, param_name: str, note: str):
         """
@@ -28,17 +76,17 @@ class LogfileLogger:
         :param note: A note.
         """
 
-        self.__write_row(
-            [
+        self.__write_rows([
+            (
                 page_title,
                 param_name,
-                "ok",  # error status
+                STATUS_OK,  # error status
                 '',  # value before
                 '',  # value after
                 '',  # has value changed,
                 note
-            ]
-        )
+            )
+        ])
 
     def log_value_change(self, page_title: str, param_name: str, value_before: str, value_after: str,
                          note: str | None = None, compare_for_changes: bool = True) -> None:
@@ -54,17 +102,17 @@ class LogfileLogger:
         Enabled by default. If disabled, nothing will be written in "changed?" column.
         """
 
-        self.__write_row(
-            [
+        self.__write_rows([
+            (
                 page_title,
                 param_name,
-                "ok",  # error status
+                STATUS_OK,  # error status
                 value_before,
                 value_after,
                 value_before != value_after if compare_for_changes else None,  # has value changed,
                 note
-            ]
-        )
+            )
+        ])
 
     def log_param_rename(self, page_title: str, param_old_name: str, param_new_name: str) -> None:
         """
@@ -75,17 +123,17 @@ class LogfileLogger:
         :param param_new_name: New name of the parameter.
         """
 
-        self.__write_row(
-            [
+        self.__write_rows([
+            (
                 page_title,
                 param_old_name,
-                "ok",  # error status
+                STATUS_OK,  # error status
                 "",  # value before
                 "",  # value after
                 "",  # has value changed
                 f"param RENAMED to: {param_new_name}"  # notes
-            ]
-        )
+            )
+        ])
 
     def log_param_removal(self, page_title: str, param_name: str, old_value: str | None = None) -> None:
         """
@@ -96,17 +144,17 @@ class LogfileLogger:
         :param old_value: Old value, if you wish to log it.
         """
 
-        self.__write_row(
-            [
+        self.__write_rows([
+            (
                 page_title,
                 param_name,
-                "ok",  # error status
+                STATUS_OK,  # error status
                 old_value,  # value before
                 "",  # value after
                 "",  # has value changed
-                f"param REMOVED"  # notes
-            ]
-        )
+                NOTE_PARAM_REMOVED  # notes
+            )
+        ])
 
     def log_param_move(self, page_title: str, param_name: str, before: str | None = None, after: str | None = None) -> None:
         """
@@ -125,17 +173,17 @@ class LogfileLogger:
         elif (before is not None) and (after is not None):
             raise Exception("both 'before' and 'after' are set")
 
-        self.__write_row(
-            [
+        self.__write_rows([
+            (
                 page_title,
                 param_name,
-                "ok",  # error status
+                STATUS_OK,  # error status
                 "",  # value before
                 "",  # value after
                 "",  # has value changed
                 f"param MOVED {'before' if before is not None else 'after'} param '{before if before is not None else after}'"  # notes
-            ]
-        )
+            )
+        ])
 
     def log_error(self, page_title: str, param_name: str, error_text: str, value_before: str | None = None,
                   value_after: str | None = None) -> None:
@@ -149,21 +197,99 @@ class LogfileLogger:
         :param value_after: New value, if relevant. `None` is used for a lack of value and is the default.
         """
 
-        self.__write_row(
-            [
+        # errors are written out right away, so they can be seen while the run is still going
+        self.__write_rows([
+            (
                 page_title,
                 param_name,
                 error_text,  # error status
                 value_before,
                 value_after,
                 value_before != value_after if (value_before is not None) and (value_after is not None) else None  # has value changed
-            ]
-        )
+            )
+        ], flush=True)
+
+    def log_batch(self, rows: Sequence[Sequence[str]]) -> None:
+        """
+        Logs multiple rows at once.
+
+        :param rows: Rows to log. Each row must follow the column order of the header row.
+        """
+
+        self.__write_rows(rows)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Collects rows logged inside the `with` block and writes them in one go once the block exits,
+        so rows of a batch always end up next to each other.
+        Batches opened inside another batch are merged into it.
+        """
+
+        if self.__batch_rows is not None:
+            yield
+            return
+
+        self.__batch_rows = []
+        try:
+            yield
+        finally:
+            rows, self.__batch_rows = self.__batch_rows, None
+            needs_flush, self.__batch_needs_flush = self.__batch_needs_flush, False
+            self.__write_rows(rows, flush=needs_flush)
+
+    def flush(self) -> None:
+        """Writes buffered rows to the log files."""
+
+        text = self.__format_rows(self.__buffered_rows)
+        self.__buffered_rows.clear()
+
+        for f in self.__files:
+            f.write(text)
+            f.flush()
+
+    def close(self) -> None:
+        """Flushes and closes the log files. Must be called once logging is done."""
+
+        if self.__closed:
+            return
+
+        self.flush()
+        for f in self.__files:
+            f.close()
+
+        self.__closed = True
+
+    def __enter__(self) -> "LogfileLogger":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __format_rows(self, rows: Iterable[Iterable[str]]) -> str:
+        """Formats given rows as csv and returns the text."""
+
+        self.__csv_writer.writerows(rows)
+        text = self.__formatted.getvalue()
+
+        self.__formatted.seek(0)
+        self.__formatted.truncate()
+
+        return text
+
+    def __write_rows(self, rows: Iterable[Iterable[str]], flush: bool = False):
+        """
+        Buffers given rows. Buffered rows are written to the disk once there's enough of them.
+
+        :param flush: Whether to write the rows to the disk right away.
+        """
 
-    def __write_row(self, row: Iterable[str]):
-        """Writes given rows to the disk."""
+        # inside a batch, rows are held back until the batch ends
+        if self.__batch_rows is not None:
+            self.__batch_rows.extend(rows)
+            self.__batch_needs_flush = self.__batch_needs_flush or flush
+            return
 
-        for filepath in self.file_log_paths:
-            with open(filepath, "a", newline="") as f:
-                csv_writer = csv.writer(f)
-                csv_writer.writerows([row])
+        self.__buffered_rows.extend(rows)
+        if flush or len(self.__buffered_rows) >= self.FLUSH_EVERY:
+            self.flush()
@@ -1,8 +1,9 @@
 import csv
 import html
 import os
+from bisect import bisect_left
 from enum import Enum
-from typing import Any, Callable, Dict, Literal, TypeVar, Generic
+from typing import Any, Callable, Dict, Iterator, Literal, Sequence, TypeVar, Generic
 
 # =========================
 # = SECTION: TRANSFORMERS =
@@ -26,8 +27,11 @@ class BaseTransformer:
 class CsvTransformer:
     """Csv transformer."""
 
-    columns: list[int]
-    """List of column indices to transform."""
+    columns: tuple[int, ...]
+    """Sorted column indices to transform. Empty when transforming all columns."""
+
+    all_columns: bool
+    """Whether to transform all columns."""
 
     def __init__(self, columns: list[int] | Literal['all']):
         """
@@ -39,22 +43,34 @@ class CsvTransformer:
         :exception Exception: When any index in `columns` is negative.
         """
 
-        self.columns = []
+        self.columns = ()
 
-        # for all columns
+        # for all columns.
+        # the column count isn't known until there's data, so it's resolved at transform time.
         if columns == 'all':
-            for i in range(len(columns)):
-                self.columns.append(i)
-
+            self.all_columns = True
             return
 
         # for a particular set of columns
-        else:
-            for i in columns:
-                if i >= 0:
-                    self.columns.append(i)
-                else:
-                    raise Exception(f"transformer setup failed: index {i} is out of bounds")
+        self.all_columns = False
+        for i in columns:
+            if i < 0:
+                raise Exception(f"transformer setup failed: index {i} is out of bounds")
+
+        self.columns = tuple(sorted(set(columns)))
+
+    def get_columns_in_bounds(self, columns_count: int) -> Sequence[int]:
+        """
+        Returns indices of columns to transform, leaving out the ones that are out of bounds.
+
+        :param columns_count: Number of columns in the data.
+        """
+
+        if self.all_columns:
+            return range(columns_count)
+
+        # columns are sorted, so everything before the first out-of-bounds index is in bounds
+        return self.columns[:bisect_left(self.columns, columns_count)]
 
     def transform(self, data: list[str]) -> list[str]:
         """
@@ -65,6 +81,45 @@ class CsvTransformer:
 
         raise NotImplementedError()
 
+    def transform_rows(self, rows: list[list[str]]) -> list[list[str]]:
+        """
+        Performs the transform on every row of the data.
+        Used to transform the whole dataset in one call instead of calling `transform()` row by row.
+
+        :param rows: Rows to transform.
+        """
+
+        transform = self.transform
+        return [transform(row) for row in rows]
+
+    def _transform_cells(self, rows: list[list[str]], cell_transform: Callable[[str], str]) -> list[list[str]]:
+        """
+        Applies given function to the cells of every row. Rows are transformed in place.
+        Indices that out of bounds will be ignored.
+
+        :param rows: Rows to transform.
+        :param cell_transform: A function that takes in a cell and returns the transformed cell.
+        """
+
+        if self.all_columns:
+            for row in rows:
+                row[:] = map(cell_transform, row)
+
+            return rows
+
+        # rows mostly have the same length, so columns in bounds are only looked up when it changes
+        row_len = -1
+        columns: Sequence[int] = ()
+        for row in rows:
+            if len(row) != row_len:
+                row_len = len(row)
+                columns = self.get_columns_in_bounds(row_len)
+
+            for i in columns:
+                row[i] = cell_transform(row[i])
+
+        return rows
+
 
 class CsvTransformerUnescapeHtml(CsvTransformer):
     """Csv transformer for unescaping html."""
@@ -80,13 +135,15 @@ class CsvTransformerUnescapeHtml(CsvTransformer):
         :param data: Data to transform.
         """
 
-        data_len = len(data)
-        for i in self.columns:
-            if i < data_len:
-                data[i] = html.unescape(data[i])
+        unescape = html.unescape
+        for i in self.get_columns_in_bounds(len(data)):
+            data[i] = unescape(data[i])
 
         return data
 
+    def transform_rows(self, rows: list[list[str]]) -> list[list[str]]:
+        return self._transform_cells(rows, html.unescape)
+
 
 class CsvTransformerStripWhitespace(CsvTransformer):
     """Csv transformer for removing whitespace from both ends of a string (cell)."""
@@ -102,13 +159,15 @@ class CsvTransformerStripWhitespace(CsvTransformer):
         :param data: Data to transform.
         """
 
-        data_len = len(data)
-        for i in self.columns:
-            if i < data_len:
-                data[i] = data[i].strip()
+        strip = str.strip
+        for i in self.get_columns_in_bounds(len(data)):
+            data[i] = strip(data[i])
 
         return data
 
+    def transform_rows(self, rows: list[list[str]]) -> list[list[str]]:
+        return self._transform_cells(rows, str.strip)
+
 # =========================
 # = SECTION: LOADERS =
 # =========================
@@ -189,35 +248,75 @@ class CsvDataLoader(BaseInputDataLoader):
             if skip_header_row:
                 next(reader, None)
 
-            self.data = []
-            for row in reader:
-                for transformer in transformers:
-                    row = transformer.transform(row)
+            self.data = list(reader)
 
-                self.data.append(row)
+        # each transformer goes over the whole dataset at once
+        for transformer in transformers:
+            self.data = transformer.transform_rows(self.data)
 
-            self.__has_loaded_data = True
+        self.__has_loaded_data = True
 
         return self.data
 
+    def iter_rows(self,
+                  transformers: list[CsvTransformer] = [],
+                  skip_header_row=False
+                  ) -> Iterator[list[str]]:
+        """
+        Reads data row by row, without storing it inside.
+        Useful when the data is only needed once, since only one row is kept in memory at a time.
+
+        :param skip_header_row: Whether to skip the first row in case you have a header in your data.
+        Disabled by default.
+        :param transformers: A list of transformer classes that perform various things with data.
+        Compatible transformers can be found under the list of classes that inherit from `CsvTransformer` class.
+        Empty list by default (disabled). Each subsequent transformer receives output of previous transformer.
+
+        :returns An iterator over rows. Each row is a list of cells (strings).
+        """
+
+        super().assert_file_exists()
+
+        with open(self.input_filepath, "r") as f:
+            reader = csv.reader(f)
+            if skip_header_row:
+                next(reader, None)
+
+            # without transformers rows are passed through as is
+            if not transformers:
+                yield from reader
+                return
+
+            transforms = [transformer.transform for transformer in transformers]
+            for row in reader:
+                for transform in transforms:
+                    row = transform(row)
+
+                yield row
+
     def extract_page_list(self,
-                          extractor_function: Callable[[list[str]], str] = lambda row: row[0]) -> list[str]:
+                          extractor_function: Callable[[list[str]], str] | None = None,
+                          transformers: list[CsvTransformer] = [],
+                          skip_header_row=False
+                          ) -> list[str]:
         """
         Extracts page list from the data and returns it.
+        If the data isn't loaded, it's read from the input file row by row instead, without loading it.
 
         :param extractor_function: A function that performs the extraction.
         Takes in a row.
         Must return a page title.
-        By default, returns the value in the first column.
-
-        :exception Exception: When called before `load()`.
+        By default (`None`), the value in the first column is used.
+        :param transformers: Transformers to apply to the rows when the data isn't loaded.
+        Refer to `iter_rows()` docs.
+        :param skip_header_row: Whether to skip the first row when the data isn't loaded.
+        Refer to `iter_rows()` docs.
         """
 
-        if not self.__has_loaded_data:
-            raise Exception("page list extracting error: call load() first")
+        rows = self.data if self.__has_loaded_data else self.iter_rows(transformers, skip_header_row)
 
-        page_titles: list[str] = []
-        for row in self.data:
-            page_titles.append(extractor_function(row))
+        # default case is done without calling a function per row
+        if extractor_function is None:
+            return [row[0] for row in rows]
 
-        return page_titles
\ No newline at end of file
+        return [extractor_function(row) for row in rows]
\ No newline at end of file
@@ -2,22 +2,27 @@ import csv
 import datetime
 import html
 import json
+import os
 import re
 import shutil
 import string
-from time import sleep, strftime
+from time import monotonic_ns, sleep, strftime
 from typing import Any, Callable, Iterable
 from datetime import datetime
 
 from mwcleric import AuthCredentials
 from mwcleric import TemplateModifierBase
 from mwcleric import WikiggClient
-from mwparserfromhell.nodes import Template
+from mwparserfromhell.nodes import Template, Text
+from mwparserfromhell.nodes.extras import Parameter
 
-from LogfileLogger import LogfileLogger
+from LogfileLogger import LogfileLogger, NOTE_PARAM_CREATED
 from input_data_loaders import BaseInputDataLoader, CsvDataLoader, CsvTransformerUnescapeHtml, \
     CsvTransformerStripWhitespace
-from utils import get_first_list_item_matching_condition
+
+# regexes for parsing the crew param, compiled once instead of on every page
+_RE_CREW_CURRENT = re.compile(r"\d+")
+_RE_CREW_SUGGESTED = re.compile(r"Suggested:\s*([+-]?(?:\d*\.)?\d+)")
 
 # =====================
 # = SETTINGS: GENERAL =
@@ -41,8 +46,10 @@ dry_run = False
 # set to large number to process all the pages.
 pages_limit = 111111111
 
-# delay for updates in seconds
-# note that this is respected even if no updated are actually happen.
+# delay for updates in seconds.
+# this is the minimum time between updates: time already spent since the previous update counts towards it.
+# only pages that are actually about to be updated are delayed (see `wait_before_update()`).
+# not used on dry runs.
 updates_delay_seconds = 0
 
 # filename of the output file.
@@ -62,6 +69,11 @@ input_filename = "input.csv"
 
 # input data loader
 input_data_loader: CsvDataLoader = CsvDataLoader(input_filename)
+
+# input data rows keyed by page title (first column), so each page finds its row in O(1).
+# if a title is repeated, the first row wins.
+input_data_by_title: dict[str, list[str]] = {}
+
 if use_input_data:
     input_data_loader.load(
         skip_header_row=True,
@@ -71,6 +83,11 @@ if use_input_data:
         ]
     )
 
+    for row in input_data_loader.data:
+        # blank lines in the csv come through as empty rows
+        if row:
+            input_data_by_title.setdefault(row[0], row)
+
 # ===========================
 # = SETTINGS: LIST OF PAGES =
 # ===========================
@@ -82,18 +99,31 @@ source_pages_from_input_data = False
 # a list of page titles to iterate over.
 page_titles: list[str] = []
 
+# number of repeated page titles dropped from the list, since each one would be fetched again.
+duplicate_page_titles_count = 0
+
 if source_pages_from_input_data:
     if not use_input_data:
         raise Exception("failed to extract page titles from input data: input data is not used")
 
     page_titles = input_data_loader.extract_page_list()
 
+    # remove duplicates, keeping the order
+    unique_page_titles = list(dict.fromkeys(page_titles))
+    duplicate_page_titles_count = len(page_titles) - len(unique_page_titles)
+    page_titles = unique_page_titles
+
+# page titles actually handed over to the runner.
+# trimmed to the limit here, so titles that won't be processed aren't sent over the API.
+effective_page_titles: list[str] | None = page_titles[:pages_limit] if source_pages_from_input_data else None
+
 # =================
 # = SCRIPT: SETUP =
 # =================
 
-# extensions of the input file
-input_ext = input_filename.split(".")[-1]
+# extension of the input file, without the dot.
+# empty if the file has no extension.
+input_ext = os.path.splitext(input_filename)[1][1:]
 
 # this is a timestamp for the current run.
 # it is a string compatible with filenames.
@@ -101,16 +131,19 @@ input_ext = input_filename.split(".")[-1]
 file_timestamp_str = strftime("%Y-%m-%d %H-%M-%S", datetime.now().timetuple())
 
 # filepath for a copy of the input file that will be saved for history.
-input_copy_rel_filepath = "input copies/" + file_timestamp_str + "." + input_ext
+input_copy_rel_filepath = "input copies/" + file_timestamp_str + ("." + input_ext if input_ext else "")
 
 # logger used for logging stuff to a logfile. uses CSV format.
+# `logfile.csv` keeps the history of all runs, while each run also gets its own logfile.
 logfile_logger = LogfileLogger([
-    "logfile.csv",
-    f"logfiles/{file_timestamp_str}.csv"
+    ("logfile.csv", "append"),
+    (f"logfiles/{file_timestamp_str}.csv", "truncate")
 ])
 
-# create a copy of the input file for history, if it's used in the current run
+# create a copy of the input file for history, if it's used in the current run.
+# on Linux `shutil.copyfile()` already copies with `os.sendfile()`, so the data doesn't leave the kernel.
 if use_input_data:
+    os.makedirs(os.path.dirname(input_copy_rel_filepath), exist_ok=True)
     shutil.copyfile(input_filename, input_copy_rel_filepath)
 
 # ================
@@ -126,284 +159,477 @@ else:
     print("[[🟠LIVE RUN🟠]]")
 
 # print the summary so have a last chance to see it until it's too late
-print("SUMMARY: " + summary)
+print("SUMMARY:", summary)
 
 # print pages count
-print(
-    "Total pages to process: "
-    + str(min(pages_limit, len(page_titles)) if source_pages_from_input_data else "unknown")
-)
+pages_count = len(effective_page_titles) if effective_page_titles is not None else "unknown"
+print(f"Total pages to process: {pages_count}")
 
+# print how many duplicate pages were skipped, so a messy input file doesn't go unnoticed
+if duplicate_page_titles_count > 0:
+    print(f"Duplicate pages skipped: {duplicate_page_titles_count}")
 
-class TemplateModifier(TemplateModifierBase):
-    def update_template(self, template: Template):
-        # delay the request so we don't get too many requests error
-        sleep(updates_delay_seconds)
 
-        # TemplateModifier is a generic framework for modifying templates
-        # It will iterate through all pages containing at least one instance
-        # of the specified template in the initialization call below and then
-        # update every instance of the template in question with one batched edit per page
-        if self.current_page.namespace != 0:
-            # don't do anything outside of the main namespace
-            # for example, we don't want to modify template documentation or user sandboxes
-            return
+# time of the previous update, as returned by `monotonic_ns()`. used by `wait_before_update()`.
+_last_update_time_ns = 0
 
-        # ===========================================
 
-        def get_param_value_from_template(
-                param_name: str,
-                default_value: str | None = None
-        ) -> str:
-            """
-            Get value of a param from the template.
-
-            :param param_name: Name of the param.
-
-            :param default_value: Default value to return if the param is missing.
-            Can only be a string. `None` by default, which is a lack of a default value.
-            If the param is missing and no default is not defined, an error will be thrown.
-            """
-
-            # check if param is missing
-            if not template.has(param_name):
-                if default_value is None:
-                    # no default
-                    raise Exception(
-                        f"failed to retrieve param '{param_name}' from the template: param is missing and no default is defined")
-                else:
-                    # yes default
-                    return default_value
-
-            # if param is not missing → get its value
-            param_value = template.get(param_name, default=default_value).value
-
-            # convert its value to string and remove whitespace on both sides
-            # (which naturally is somehow always there)
-            return str(param_value).strip()
-
-        def set_param_value(param_name: str, value: str, before: str | None = None, after: str | None = None, *args: object, **kwargs: object) -> None:
-            """
-            Sets value of a param in the current template.
-
-            `*args` and `**kwargs` are passed through to the underlying `template.add()`.
-
-            :param param_name: Name of the param.
-            :param value: Value of the param.
-            :param before: Name of a param that our param should go before.
-            Specify either this, or `after:`.
-            :param after: Name of a param that our param should go after.
-            Specify either this, or `before:`.
-
-            :exception Exception: If both `before` and `after` are not specified.
-            :exception Exception: If both `before` and `after` are specified.
-            :exception Exception: If parameter `before`/`after` is specified and doesn't exist.
-            """
-
-            param_exists = template.has(param_name)
-            previous_value = get_param_value_from_template(param_name) if param_exists else None
-
-            if after is not None:
-                # since template.add doesn't have "after" param, we need to do it ourselves.
-                # based on code from local `move_param()`
-                if not template.has(after):
-                    raise Exception(f"after param '{after}' is missing from the template")
-
-                if param_exists:
-                    remove_param(param_name)
-
-                # find the next param after the "after" param, so we can place our param before it
-                after_param_index_matches = [i for i in range(len(template.params)) if
-                                             template.params[i].name == after]
-                # match is guaranteed since we've already checked that template has "after" param
-                after_param_index = after_param_index_matches[0]
-
-                if not dry_run:
-                    # if "after" param is the last param in the template,
-                    # we can simply add our param - it will be appended to the end of param list
-                    if after_param_index == len(template.params) - 1:
-                        template.add(param_name, value, *args, **kwargs)
-                    # otherwise we add our param before the next param after the "after" param
-                    else:
-                        template.add(param_name, value, before=template.params[after_param_index + 1].name, *args, **kwargs)
+def wait_before_update() -> None:
+    """
+    Delays an update so we don't get too many requests error.
+    Call it once per page, right before the first change to the template,
+    so pages that end up not being changed aren't delayed.
+    """
+
+    global _last_update_time_ns
+
+    # skipped entirely when there's no delay or nothing is going to be saved,
+    # so it doesn't cost a syscall per page
+    if updates_delay_seconds > 0 and not dry_run:
+        # only wait for what's left of the delay after the time already spent since the previous update
+        wait_seconds = updates_delay_seconds - (monotonic_ns() - _last_update_time_ns) / 1e9
+        if wait_seconds > 0:
+            sleep(wait_seconds)
+
+        _last_update_time_ns = monotonic_ns()
+
+
+class _ParamIndex:
+    """
+    Lookup of template params by name.
+    Built once and queried many times, instead of walking the template params on every check.
+    Must be invalidated whenever params are added or removed.
+    """
+
+    def __init__(self, template: Template):
+        self.template = template
+        self.__index_by_name: dict[str, int] | None = None
+
+    @staticmethod
+    def key(param_name: object) -> str:
+        """
+        Returns the key given param name is looked up by.
+        Names are compared without surrounding whitespace, same as `template.has()` does.
+        Accepts anything convertible to a string, including a param's own `.name`.
+        """
+
+        return str(param_name).strip()
+
+    def __get_index_by_name(self) -> dict[str, int]:
+        if self.__index_by_name is None:
+            # if a name is repeated, the last param wins, same as `template.get()` does.
+            key = self.key
+            self.__index_by_name = {key(param.name): i for i, param in enumerate(self.template.params)}
+
+        return self.__index_by_name
+
+    def has(self, param_name: str) -> bool:
+        """Checks whether the template has given param."""
+
+        return self.key(param_name) in self.__get_index_by_name()
+
+    def index(self, param_name: str) -> int:
+        """
+        Returns index of given param in `template.params`.
+
+        :exception KeyError: If param doesn't exist.
+        """
+
+        return self.__get_index_by_name()[self.key(param_name)]
+
+    def get(self, param_name: str) -> Parameter:
+        """
+        Returns given param.
+
+        :exception KeyError: If param doesn't exist.
+        """
+
+        return self.template.params[self.index(param_name)]
+
+    def invalidate(self) -> None:
+        """Drops the index. It will be rebuilt on the next query."""
+
+        self.__index_by_name = None
+
+
+class TemplateOps:
+    """
+    Operations on params of a template, with logging and dry run support.
+    Created once per page.
+    """
+
+    __slots__ = ("template", "page_title", "param_index", "param_values_cache")
+
+    def __init__(self, template: Template, page_title: str):
+        """
+        :param template: Template to operate on.
+        :param page_title: Title of the page the template is on. Used for logging.
+        """
+
+        self.template = template
+        self.page_title = page_title
+        self.param_index = _ParamIndex(template)
+
+        # values of params that were already read, so repeated reads don't convert the value to string again.
+        # entries are keyed the same way as the param index and dropped whenever their param is changed.
+        self.param_values_cache: dict[str, str] = {}
+
+    def has_param(self, param_name: str) -> bool:
+        """
+        Checks whether the template has given param.
+
+        :param param_name: Name of the param.
+        """
+
+        return self.param_index.has(param_name)
+
+    def get_param_value_from_template(
+            self,
+            param_name: str,
+            default_value: str | None = None
+    ) -> str:
+        """
+        Get value of a param from the template.
+
+        :param param_name: Name of the param.
+
+        :param default_value: Default value to return if the param is missing.
+        Can only be a string. `None` by default, which is a lack of a default value.
+        If the param is missing and no default is not defined, an error will be thrown.
+        """
+
+        # check if param is missing
+        if not self.param_index.has(param_name):
+            if default_value is None:
+                # no default
+                raise Exception(
+                    f"failed to retrieve param '{param_name}' from the template: param is missing and no default is defined")
             else:
-                if not dry_run:
-                    template.add(param_name, value, *args, **kwargs)
-
-            logfile_logger.log_value_change(
-                self.current_page.page_title,
-                param_name,
-                previous_value,
-                value,  # new value,
-                note='param CREATED' if not param_exists else None,  # add a note when param doesn't exist
-                compare_for_changes=param_exists
-                # if param exists, compare it for changes, otherwise - param is created, so no comparison is needed
-            )
+                # yes default
+                return default_value
+
+        # if param is not missing → get its value
+        return self.__get_param_value_unchecked(param_name)
+
+    def __get_param_value_unchecked(self, param_name: str) -> str:
+        """
+        Get value of a param from the template, without checking whether it exists.
+        Used when the caller has already checked that.
+
+        :param param_name: Name of the param.
+        """
+
+        cache_key = _ParamIndex.key(param_name)
+        if cache_key in self.param_values_cache:
+            return self.param_values_cache[cache_key]
+
+        param_value = self.param_index.get(param_name).value
+
+        # convert its value to string and remove whitespace on both sides
+        # (which naturally is somehow always there).
+        # plain text values are a single text node, which can be read directly without serializing the node tree.
+        nodes = param_value.nodes
+        if len(nodes) == 1 and isinstance(nodes[0], Text):
+            value = nodes[0].value.strip()
+        else:
+            value = str(param_value).strip()
+        self.param_values_cache[cache_key] = value
+
+        return value
+
+    def set_param_value(self, param_name: str, value: str, before: str | None = None, after: str | None = None, *args: object, **kwargs: object) -> None:
+        """
+        Sets value of a param in the current template.
+
+        `*args` and `**kwargs` are passed through to the underlying `template.add()`.
+
+        :param param_name: Name of the param.
+        :param value: Value of the param.
+        :param before: Name of a param that our param should go before.
+        Specify either this, or `after:`.
+        :param after: Name of a param that our param should go after.
+        Specify either this, or `before:`.
+
+        :exception Exception: If both `before` and `after` are not specified.
+        :exception Exception: If both `before` and `after` are specified.
+        :exception Exception: If parameter `before`/`after` is specified and doesn't exist.
+        """
+
+        if (before is not None) and (after is not None):
+            raise Exception("both 'before' and 'after' are set")
+
+        param_exists = self.param_index.has(param_name)
+        previous_value = self.__get_param_value_unchecked(param_name) if param_exists else None
+
+        if after is not None:
+            # since template.add doesn't have "after" param, we need to do it ourselves.
+            # based on code from `move_param()`
+            if not self.param_index.has(after):
+                raise Exception(f"after param '{after}' is missing from the template")
+
+            if param_exists:
+                self.__remove_param_raw(param_name, previous_value)
+
+            self.__set_param_raw(param_name, value, previous_value, self.__get_param_name_following(after), *args, **kwargs)
+        else:
+            if (before is not None) and not self.param_index.has(before):
+                raise Exception(f"before param '{before}' is missing from the template")
+
+            self.__set_param_raw(param_name, value, previous_value, before, *args, **kwargs)
+
+    def __set_param_raw(self, param_name: str, value: str, previous_value: str | None, insert_before: str | None = None,
+                        *args: object, **kwargs: object) -> None:
+        """
+        Sets value of a param in the current template, without any checks.
+        Used when the caller has already looked up everything needed.
+
+        `*args` and `**kwargs` are passed through to the underlying `template.add()`.
+
+        :param param_name: Name of the param.
+        :param value: Value of the param.
+        :param previous_value: Current value of the param, or `None` if the param doesn't exist.
+        :param insert_before: Name of a param that our param should go before.
+        `None` to let `template.add()` decide, which appends new params to the end.
+        """
+
+        param_exists = previous_value is not None
+
+        if not dry_run:
+            if insert_before is not None:
+                self.template.add(param_name, value, before=insert_before, *args, **kwargs)
+            else:
+                self.template.add(param_name, value, *args, **kwargs)
 
-        def remove_param(param_name: str, *args: object, **kwargs: object) -> None:
-            """
-            Removes given param from the template.
+            self.param_index.invalidate()
+            self.param_values_cache.pop(_ParamIndex.key(param_name), None)
 
-            `*args` and `**kwargs` are passed through to the underlying `template.remove()`.
+        logfile_logger.log_value_change(
+            self.page_title,
+            param_name,
+            previous_value,
+            value,  # new value,
+            note=NOTE_PARAM_CREATED if not param_exists else None,  # add a note when param doesn't exist
+            compare_for_changes=param_exists
+            # if param exists, compare it for changes, otherwise - param is created, so no comparison is needed
+        )
 
-            :param param_name: Name of the param.
+    def __get_param_name_following(self, param_name: str) -> str | None:
+        """
+        Returns name of the param that follows given param, or `None` if given param is the last one.
+        Param must exist.
 
-            :exception Exception: If param doesn't exist.
-            """
+        :param param_name: Name of the param.
+        """
 
-            if not template.has(param_name):
-                raise Exception(f"failed to remove param '{param_name}': param doesn't exist")
+        params = self.template.params
+        param_i = self.param_index.index(param_name)
 
-            value = get_param_value_from_template(param_name)
+        if param_i == len(params) - 1:
+            return None
 
-            if not dry_run:
-                template.remove(param_name)
+        return params[param_i + 1].name
 
-            logfile_logger.log_param_removal(
-                self.current_page.page_title,
-                param_name,
-                value
-            )
+    def remove_param(self, param_name: str, *args: object, **kwargs: object) -> None:
+        """
+        Removes given param from the template.
+
+        `*args` and `**kwargs` are passed through to the underlying `template.remove()`.
+
+        :param param_name: Name of the param.
+
+        :exception Exception: If param doesn't exist.
+        """
+
+        if not self.param_index.has(param_name):
+            raise Exception(f"failed to remove param '{param_name}': param doesn't exist")
 
-        def rename_param(param_name: str, param_new_name: str) -> None:
-            """
-            Renames given template parameter.
-            This is done by retrieving the param value, adding a new param right before it and deleting the original param.
+        self.__remove_param_raw(param_name, self.__get_param_value_unchecked(param_name), *args, **kwargs)
 
-            :param param_name: Name of the param to rename.
-            :param param_new_name: New name for the param.
+    def __remove_param_raw(self, param_name: str, value: str, *args: object, **kwargs: object) -> None:
+        """
+        Removes given param from the template, without any checks.
+        Used when the caller has already looked up the param value.
 
-            :exception Exception: If parameter doesn't exist.
-            """
+        `*args` and `**kwargs` are passed through to the underlying `template.remove()`.
 
-            if not template.has(param_name):
-                raise Exception(f"failed to rename param '{param_name}': param doesn't exist")
+        :param param_name: Name of the param.
+        :param value: Current value of the param, for logging.
+        """
 
-            # get value
-            value = get_param_value_from_template(param_name)
+        if not dry_run:
+            self.template.remove(param_name, *args, **kwargs)
+            self.param_index.invalidate()
+            self.param_values_cache.pop(_ParamIndex.key(param_name), None)
 
-            if not dry_run:
-                # add new param
-                set_param_value(param_new_name, value, before=param_name)
+        logfile_logger.log_param_removal(
+            self.page_title,
+            param_name,
+            value
+        )
 
-                # delete old param
-                remove_param(param_name)
+    def rename_param(self, param_name: str, param_new_name: str) -> None:
+        """
+        Renames given template parameter.
+        This is done by retrieving the param value, adding a new param right before it and deleting the original param.
 
-            logfile_logger.log_param_rename(
-                self.current_page.page_title,
-                param_name,
-                param_new_name
+        :param param_name: Name of the param to rename.
+        :param param_new_name: New name for the param.
+
+        :exception Exception: If parameter doesn't exist.
+        """
+
+        if not self.param_index.has(param_name):
+            raise Exception(f"failed to rename param '{param_name}': param doesn't exist")
+
+        # get value
+        value = self.__get_param_value_unchecked(param_name)
+
+        if not dry_run:
+            # add new param
+            new_param_previous_value = (
+                self.__get_param_value_unchecked(param_new_name) if self.param_index.has(param_new_name) else None
             )
+            self.__set_param_raw(param_new_name, value, new_param_previous_value, param_name)
 
-        def move_param(param_name: str, before: str | None = None, after: str | None = None) -> None:
-            """
-            Moves parameter before or after another parameter.
-            Specify either `before` or `after`, but not both.
-            Will throw an error if any of the parameters do not exist.
-
-            :param param_name: Name of the parameter to move.
-            :param before: Name of a param that our param should go before.
-            Specify either this, or `after:`.
-            :param after: Name of a param that our param should go after.
-            Specify either this, or `before:`.
-
-            :exception Exception: If both `before` and `after` are not specified.
-            :exception Exception: If both `before` and `after` are specified.
-            :exception Exception: If parameter `param_name` doesn't exist.
-            :exception Exception: If parameter `before`/`after` doesn't exist.
-
-            :return:
-            """
-
-            if before is None and after is None:
-                raise Exception("both 'before' and 'after' are 'None'")
-            elif (before is not None) and (after is not None):
-                raise Exception("both 'before' and 'after' are set")
-            elif not template.has(param_name):
-                raise Exception(f"param '{param_name}' is missing from the template")
-
-            if before is not None:
-                if not template.has(before):
-                    raise Exception(f"before param '{before}' is missing from the template")
-
-                param_value = get_param_value_from_template(param_name)
-                remove_param(param_name)
-                set_param_value(param_name, param_value, before=before)
-
-                logfile_logger.log_param_move(self.current_page.page_title, param_name, before=before)
-            else:
-                if not template.has(after):
-                    raise Exception(f"after param '{after}' is missing from the template")
+            # delete old param
+            self.__remove_param_raw(param_name, value)
 
-                param_value = get_param_value_from_template(param_name)
-                remove_param(param_name)
+        logfile_logger.log_param_rename(
+            self.page_title,
+            param_name,
+            param_new_name
+        )
 
-                # find the next param after the "after" param, so we can place our param before it
-                after_param_index_matches = [i for i in range(len(template.params)) if template.params[i].name == after]
-                # match is guaranteed since we've already checked that template has "after" param
-                after_param_index = after_param_index_matches[0]
+    def move_param(self, param_name: str, before: str | None = None, after: str | None = None) -> None:
+        """
+        Moves parameter before or after another parameter.
+        Specify either `before` or `after`, but not both.
+        Will throw an error if any of the parameters do not exist.
 
-                # if "after" param is the last param in the template,
-                # we can simply add our param - it will be appended to the end of param list
-                if after_param_index == len(template.params) - 1:
-                    set_param_value(param_name, param_value)
-                # otherwise we add our param before the next param after the "after" param
-                else:
-                    set_param_value(param_name, param_value, before=template.params[after_param_index + 1].name)
+        :param param_name: Name of the parameter to move.
+        :param before: Name of a param that our param should go before.
+        Specify either this, or `after:`.
+        :param after: Name of a param that our param should go after.
+        Specify either this, or `before:`.
 
-                set_param_value(param_name, param_value, before=before)
+        :exception Exception: If both `before` and `after` are not specified.
+        :exception Exception: If both `before` and `after` are specified.
+        :exception Exception: If parameter `param_name` doesn't exist.
+        :exception Exception: If parameter `before`/`after` doesn't exist.
 
-                logfile_logger.log_param_move(self.current_page.page_title, param_name, after=after)
+        :return:
+        """
 
-        # ================
-        # = SCRIPT: MAIN =
-        # ================
+        if before is None and after is None:
+            raise Exception("both 'before' and 'after' are 'None'")
+        elif (before is not None) and (after is not None):
+            raise Exception("both 'before' and 'after' are set")
+        elif not self.param_index.has(param_name):
+            raise Exception(f"param '{param_name}' is missing from the template")
+
+        if before is not None:
+            if not self.param_index.has(before):
+                raise Exception(f"before param '{before}' is missing from the template")
+
+            param_value = self.__get_param_value_unchecked(param_name)
+            self.__remove_param_raw(param_name, param_value)
+            self.__set_param_raw(param_name, param_value, None, before)
+
+            logfile_logger.log_param_move(self.page_title, param_name, before=before)
+        else:
+            if not self.param_index.has(after):
+                raise Exception(f"after param '{after}' is missing from the template")
+
+            param_value = self.__get_param_value_unchecked(param_name)
+            self.__remove_param_raw(param_name, param_value)
+
+            # find the next param after the "after" param, so we can place our param before it.
+            # if "after" param is the last param in the template,
+            # we can simply add our param - it will be appended to the end of param list
+            self.__set_param_raw(param_name, param_value, None, self.__get_param_name_following(after))
+
+            logfile_logger.log_param_move(self.page_title, param_name, after=after)
+
+
+class TemplateModifier(TemplateModifierBase):
+    def update_template(self, template: Template):
+        # all rows logged for a page are written together, in one go
+        with logfile_logger.batch():
+            self.__update_template(template)
+
+    def __update_template(self, template: Template):
+        # TemplateModifier is a generic framework for modifying templates
+        # It will iterate through all pages containing at least one instance
+        # of the specified template in the initialization call below and then
+        # update every instance of the template in question with one batched edit per page
+        if self.current_page.namespace != 0:
+            # don't do anything outside of the main namespace
+            # for example, we don't want to modify template documentation or user sandboxes
+            return
+
+        # ===========================================
+
+        page_title = self.current_page.page_title
+        ops = TemplateOps(template, page_title)
+
+        # ==================
+        # = SCRIPT: CHECKS =
+        # ==================
+
+        # checks that skip the page go here, before any changes are made.
 
         # main_param_name = "hyperdrive_efficiency_percentage"
         #
-        # matching_input_entry = get_first_list_item_matching_condition(input_data_loader.data, lambda entry: entry[0] == self.current_page.page_title)
+        # matching_input_entry = input_data_by_title.get(page_title)
         # if matching_input_entry is None:
         #     # do nothing...
-        #     logfile_logger.log_error(self.current_page.page_title, main_param_name, 'no matching input entry')
+        #     logfile_logger.log_error(page_title, main_param_name, 'no matching input entry')
         #     return
-        #
-        # new_value = "absent"
-        #
-        # set_param_value(main_param_name, new_value)
 
         crew_param_name = "crew"
         suggested_crew_param_name = "suggested_crew"
 
         # check if param was already added
-        if template.has(suggested_crew_param_name):
+        if ops.has_param(suggested_crew_param_name):
             # do nothing...
-            logfile_logger.log_note(self.current_page.page_title, crew_param_name, "already processed")
+            logfile_logger.log_note(page_title, crew_param_name, "already processed")
             return
 
-        if not template.has(crew_param_name):
+        if not ops.has_param(crew_param_name):
             # do nothing...
-            logfile_logger.log_error(self.current_page.page_title, crew_param_name, 'param is not present')
+            logfile_logger.log_error(page_title, crew_param_name, 'param is not present')
             return
 
-        param_value_str = get_param_value_from_template(crew_param_name)
-        crew_current = re.search(r"\d+", param_value_str, re.MULTILINE)
-        if crew_current is None:
+        # ================
+        # = SCRIPT: MAIN =
+        # ================
+
+        # new_value = "absent"
+        #
+        # wait_before_update()
+        # ops.set_param_value(main_param_name, new_value)
+
+        param_value_str = ops.get_param_value_from_template(crew_param_name)
+        # the current count is the first number anywhere in the value, even if it's the suggested one
+        crew_current_match = _RE_CREW_CURRENT.search(param_value_str)
+        if crew_current_match is None:
             # do nothing...
-            logfile_logger.log_error(self.current_page.page_title, crew_param_name, 'failed to extract the current crew count', param_value_str)
+            logfile_logger.log_error(page_title, crew_param_name, 'failed to extract the current crew count', param_value_str)
             return
 
-        crew_current = int(crew_current.group(0))
-
-        crew_suggested = re.search(r"Suggested: ([+-]?([0-9]*[.])?[0-9]+)", param_value_str)
-        if crew_suggested is None:
+        crew_suggested_match = _RE_CREW_SUGGESTED.search(param_value_str)
+        if crew_suggested_match is None:
             # do nothing...
-            logfile_logger.log_error(self.current_page.page_title, crew_param_name, 'failed to extract the suggested crew count', param_value_str)
+            logfile_logger.log_error(page_title, crew_param_name, 'failed to extract the suggested crew count', param_value_str)
             return
 
-        crew_suggested = int(crew_suggested.group(1))
+        crew_current = int(crew_current_match.group(0))
+        # suggested count can be fractional, so it's parsed as a float first
+        crew_suggested = int(float(crew_suggested_match.group(1)))
 
-        set_param_value(crew_param_name, str(crew_current))
-        set_param_value(suggested_crew_param_name, str(crew_suggested), after=crew_param_name)
+        wait_before_update()
+        ops.set_param_value(crew_param_name, str(crew_current))
+        ops.set_param_value(suggested_crew_param_name, str(crew_suggested), after=crew_param_name)
 
         # any changes made before returning will automatically be saved by the runner
         return
@@ -418,5 +644,7 @@ TemplateModifier(
     template_name,
     summary=summary,
     limit=pages_limit,
-    title_list=(page_titles if source_pages_from_input_data else None),
+    title_list=effective_page_titles,
 ).run()
+
+logfile_logger.close()
@@ -19,28 +19,60 @@ def raiseException(text: str):
     raise Exception()
 
 
-def eprint(*args: Any, **kwargs: Any):
-    print(*args, file=sys.stderr, **kwargs)
+def eprint(*args: Any, sep: str | None = " ", end: str | None = "\n", **kwargs: Any):
+    if kwargs:
+        # other print() options (file, flush) go through print() itself
+        kwargs.setdefault("file", sys.stderr)
+        print(*args, sep=sep, end=end, **kwargs)
+        return
+
+    # `None` means the default, same as in print()
+    if sep is None:
+        sep = " "
+    if end is None:
+        end = "\n"
+
+    # the message is joined up front and written in one call
+    sys.stderr.write(sep.join(map(str, args)) + end)
 
 
 def flatten(list_of_lists: Iterable[Iterable[Any]]):
+    # fast path for a list of lists: extending by whole lists skips going through the items one by one
+    if isinstance(list_of_lists, list) and all(isinstance(sub_list, list) for sub_list in list_of_lists):
+        flat_list = []
+        extend = flat_list.extend
+        for sub_list in list_of_lists:
+            extend(sub_list)
+
+        return flat_list
+
     return list(itertools.chain.from_iterable(list_of_lists))
 
 
 def get_first_list_item_or_none(list: list[Any]):
-    if len(list) > 0:
-        return list[0]
-    else:
-        return None
+    return list[0] if list else None
 
 
 def remove_first_item_from_list_matching_condition(
         list: list[Any], condition: Callable[[Any], bool]
 ) -> None:
-    for i, item in enumerate(list):
-        if condition(item):
-            list.pop(i)
-            break
+    i = next((i for i, item in enumerate(list) if condition(item)), -1)
+    if i >= 0:
+        del list[i]
+
+
+def swap_remove_first_item_from_list_matching_condition(
+        list: list[Any], condition: Callable[[Any], bool]
+) -> None:
+    """
+    Same as `remove_first_item_from_list_matching_condition()`, but doesn't preserve the order of items:
+    the removed item is replaced by the last item, so the rest of the list doesn't need to be shifted.
+    """
+
+    i = next((i for i, item in enumerate(list) if condition(item)), -1)
+    if i >= 0:
+        list[i] = list[-1]
+        list.pop()
 
 
 def get_first_list_item_matching_condition(
@@ -52,16 +84,27 @@ def get_first_list_item_matching_condition(
 
 
 def not_none(obj: Optional[T]) -> T:
-    assert obj is not None
+    # not an `assert`, since those are stripped when running with `-O`
+    if obj is None:
+        raise ValueError("expected a value, got None")
+
     return obj
 
 
 def clamp_int(value: int, min_lim: int, max_lim: int) -> int:
-    return max(min_lim, min(value, max_lim))
+    # plain comparisons instead of `max(min())`, which costs two builtin calls
+    value = max_lim if max_lim < value else value
+    return value if value > min_lim else min_lim
 
 
 def clamp_float(value: float, min_lim: int | float, max_lim: int | float) -> float:
-    return max(min_lim, min(value, max_lim))
+    # same comparisons as max(min_lim, min(value, max_lim)), so NaN still clamps to min_lim
+    value = max_lim if max_lim < value else value
+    return value if value > min_lim else min_lim
+
+
+# directories that were already created (or found to exist) by `open_with_create_missing_directories()`
+_ensured_dirs: set[str] = set()
 
 
 def open_with_create_missing_directories(filepath: str, mode: str, *args, **kwargs):
@@ -77,6 +120,10 @@ def open_with_create_missing_directories(filepath: str, mode: str, *args, **kwar
     :return: Filestream.
     """
 
-    dir_path = os.path.split(os.path.abspath(filepath))[0]
-    os.makedirs(dir_path, exist_ok=True)
+    # each directory is only created once per run
+    dir_path = os.path.dirname(filepath) or "."
+    if dir_path not in _ensured_dirs:
+        os.makedirs(dir_path, exist_ok=True)
+        _ensured_dirs.add(dir_path)
+
     return open(filepath, mode, *args, **kwargs)